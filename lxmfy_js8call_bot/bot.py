@@ -1,20 +1,81 @@
 """JS8Call LXMF Bot implementation for message forwarding between JS8Call and LXMF networks."""
 
 import configparser
-import concurrent.futures
-import json
 import logging
+import os
+import queue
+import re
+import select
+import sys
 import threading
 import time
-from collections import defaultdict
-from datetime import datetime, timedelta
-from logging.handlers import RotatingFileHandler
-from socket import socket, AF_INET, SOCK_STREAM
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from logging.handlers import QueueHandler, QueueListener
+from socket import (
+    socket,
+    AF_INET,
+    IPPROTO_TCP,
+    SO_KEEPALIVE,
+    SOCK_STREAM,
+    SOL_SOCKET,
+    TCP_NODELAY,
+)
+
+try:
+    from socket import TCP_KEEPCNT, TCP_KEEPIDLE, TCP_KEEPINTVL
+except ImportError:  # Not available on every platform
+    TCP_KEEPCNT = TCP_KEEPIDLE = TCP_KEEPINTVL = None
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 from lxmfy import LXMFBot
 
+from .log_handlers import AsyncRotatingFileHandler
 from .storage.sqlite_storage import SQLiteStorage
 
+# Pending message inserts are flushed once this many are queued...
+INSERT_BATCH_SIZE = 50
+# ...or once this many seconds have passed since the last flush.
+INSERT_FLUSH_INTERVAL = 1.0
+# Seconds between writes of changed user state to storage
+USER_STATE_FLUSH_INTERVAL = 1.0
+# Maximum number of outgoing LXMF messages waiting for a send worker
+SEND_QUEUE_SIZE = 10000
+# Largest partial JS8Call message buffered while waiting for its newline
+RX_BUFFER_LIMIT = 1024 * 1024
+# Delay before reconnecting to JS8Call, doubled after every failed attempt
+RECONNECT_DELAY_MIN = 0.5
+RECONNECT_DELAY_MAX = 30
+# TCP keepalive: idle seconds before probing, probe interval, probe count
+KEEPALIVE_OPTIONS = ((TCP_KEEPIDLE, 30), (TCP_KEEPINTVL, 10), (TCP_KEEPCNT, 3))
+# Storage key prefix for per-user state. Keys become file names with lxmfy's
+# JSONStorage, so the prefix must not contain characters such as ":". It is
+# namespaced to stay clear of lxmfy's own keys like "user_roles:<hash>"
+USER_KEY_PREFIX = "js8user_"
+# Seconds a /stats database result is reused before querying again
+STATS_CACHE_TTL = 60
+
+_HELP_TEXT = (
+    "Available commands:\n"
+    "/add - Add yourself to the JS8Call message group\n"
+    "/remove - Remove yourself from the JS8Call message group\n"
+    "/groups - Show available groups and your subscriptions\n"
+    "/join <group1> <group2> ... - Join one or more groups\n"
+    "/leave <group> - Leave a specific group\n"
+    "/mute <group1> <group2> ... or ALL - Mute one or more groups or all groups\n"
+    "/unmute <group1> <group2> ... or ALL - Unmute one or more groups or all groups\n"
+    "/help - Show this help message\n"
+    "/showlog <number> - Show the last <number> messages (max 50)\n"
+    "/stats - Show current stats\n"
+    "/stats <day|month> - Show stats for the specified period\n"
+    "/info - Show bot information\n"
+    "/analytics [day|week] - Show usage statistics"
+)
+
 
 class JS8CallBot(LXMFBot):
     """JS8Call LXMF Bot for message forwarding between JS8Call and LXMF networks."""
@@ -28,23 +89,25 @@ class JS8CallBot(LXMFBot):
         # Initialize additional attributes
         self.js8call_socket = None
         self.js8call_connected = False
-        self.bot_location = None
-        self.node_operator = None
-        self.thread_pool = concurrent.futures.ThreadPoolExecutor()
-        self.blocked_words = []
+        self._rxbuf = bytearray()
+        self._rx_discarding = False
+        self._reconnect_delay = RECONNECT_DELAY_MIN
+        self._pending_inserts = deque()
+        self._pending_lock = threading.Lock()
+        self._last_insert_flush = time.monotonic()
+        self._dirty_users = set()
+        self._dirty_lock = threading.Lock()
+        self._shutdown = threading.Event()
 
         # Load config first
-        self.config = configparser.ConfigParser()
-        self.config.read("config.ini")
+        self._load_config()
 
         # Initialize LXMFBot with config values
         super().__init__(
             name=name,
-            announce=self.config.getint("bot", "announce_interval", fallback=360),
+            announce=self.announce_interval,
             announce_immediately=True,
-            admins=self.config.get("bot", "allowed_users", fallback="")
-            .strip()
-            .split(","),
+            admins=self.allowed_users,
             hot_reloading=True,
             rate_limit=5,
             cooldown=60,
@@ -54,21 +117,47 @@ class JS8CallBot(LXMFBot):
         )
 
         # Setup SQLite storage after parent initialization
-        self.db = SQLiteStorage(
-            self.config.get("js8call", "db_file", fallback="js8call.db")
-        )
+        self.db = SQLiteStorage(self.db_file)
 
         self.setup_logging()
         self.setup_js8call()
         self.setup_state()
 
+    def _load_config(self):
+        """Read config.ini once into plain attributes"""
+        self.config = configparser.ConfigParser()
+        self.config.read("config.ini")
+
+        def get_list(section, option):
+            value = self.config.get(section, option, fallback="")
+            return [item.strip() for item in value.split(",") if item.strip()]
+
+        self.announce_interval = self.config.getint(
+            "bot", "announce_interval", fallback=360
+        )
+        self.allowed_users = get_list("bot", "allowed_users")
+        self.default_groups = tuple(get_list("bot", "default_groups"))
+        self.blocked_words = get_list("bot", "blocked_words")
+        self.bot_location = self.config.get("bot", "location", fallback="") or None
+        self.node_operator = (
+            self.config.get("bot", "node_operator", fallback="") or None
+        )
+
+        self.db_file = self.config.get("js8call", "db_file", fallback="js8call.db")
+        self.js8call_server = (
+            self.config.get("js8call", "host", fallback="localhost"),
+            self.config.getint("js8call", "port", fallback=2442),
+        )
+        self.js8groups = get_list("js8call", "js8groups")
+        self.js8urgent = get_list("js8call", "js8urgent")
+
     def setup_logging(self):
         """Configure logging handlers and formatters."""
         self.logger = logging.getLogger("js8call_lxmf_bot")
         self.logger.setLevel(logging.INFO)
 
         handlers = [
-            RotatingFileHandler(
+            AsyncRotatingFileHandler(
                 "js8call_lxmf_bot.log", maxBytes=1000000, backupCount=5
             ),
             logging.StreamHandler(),
@@ -77,30 +166,68 @@ class JS8CallBot(LXMFBot):
         for handler in handlers:
             formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
             handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+
+        # Log calls only enqueue records; file and console output happen on
+        # the listener's background thread
+        log_queue = queue.Queue(-1)
+        self.logger.addHandler(QueueHandler(log_queue))
+        self.log_listener = QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self.log_listener.start()
 
     def setup_js8call(self):
         """Initialize JS8Call connection settings."""
-        self.js8call_server = (
-            self.config.get("js8call", "host", fallback="localhost"),
-            self.config.getint("js8call", "port", fallback=2442),
-        )
         self.js8call_socket = None
         self.js8call_connected = False
 
         # JS8Call specific settings
-        self.js8groups = self.config.get("js8call", "js8groups", fallback="").split(",")
-        self.js8urgent = self.config.get("js8call", "js8urgent", fallback="").split(",")
-        self.js8groups = [group.strip() for group in self.js8groups]
-        self.js8urgent = [group.strip() for group in self.js8urgent]
+        self.js8groups_set = frozenset(g for g in self.js8groups if g)
+        self.js8urgent_set = frozenset(g for g in self.js8urgent if g)
+
+        # Map each group prefix to its message kind, longest prefix first.
+        # Regular groups win over urgent groups with the same name.
+        self._group_routes = {g: "urgent" for g in self.js8urgent if g}
+        self._group_routes.update({g: "group" for g in self.js8groups if g})
+        self._sorted_prefixes = sorted(self._group_routes, key=len, reverse=True)
+        self._available_groups = tuple(
+            dict.fromkeys(g for g in self.js8groups + self.js8urgent if g)
+        )
+
+        self.compile_blocked_words()
+
+    def compile_blocked_words(self):
+        """Build a single regex matching any of the blocked words"""
+        # Patterns are matched against lowercased content rather than using
+        # re.IGNORECASE, keeping str.lower() semantics for non-ASCII text
+        words = dict.fromkeys(word.lower() for word in self.blocked_words if word)
+        self._blocked_re = (
+            re.compile("|".join(map(re.escape, words))) if words else None
+        )
 
     def setup_state(self):
         """Initialize bot state and load users from storage"""
         # Initialize state
         self.distro_list = set()
-        self.user_groups = defaultdict(set)
-        self.muted_users = defaultdict(set)
+        # Per-user (subscribed, muted) group bitmasks, indexed by _group_idx
+        self._user_state = {}
+        self._group_idx = {}
+        self._groups_by_idx = []
+        for group in self._available_groups:
+            self._group_bit(group)
+        # Reverse indexes: group -> users subscribed to / muting it
+        self.group_subscribers = defaultdict(set)
+        self.group_muted = defaultdict(set)
         self.start_time = time.time()
+        self._stats_cache = {}
+
+        # Outgoing LXMF messages are handed off to long-lived send workers
+        self.send_queue = queue.Queue(maxsize=SEND_QUEUE_SIZE)
+        for i in range(max(4, os.cpu_count() or 1)):
+            worker = threading.Thread(
+                target=self._send_worker, name=f"lxmf-send-{i}", daemon=True
+            )
+            worker.start()
 
         # Load existing state from storage
         self.load_state_from_storage()
@@ -108,51 +235,139 @@ class JS8CallBot(LXMFBot):
     def load_state_from_storage(self):
         """Load users and their settings from storage"""
         try:
-            # Load distribution list
+            for key in self.storage.scan(USER_KEY_PREFIX):
+                try:
+                    user_data = self.storage.get(key)
+                    if not isinstance(user_data, dict):
+                        self.logger.warning("Skipping unexpected user entry %s", key)
+                        continue
+                    self._load_user(key[len(USER_KEY_PREFIX) :], user_data)
+                except Exception as e:
+                    self.logger.error("Error loading %s from storage: %s", key, e)
+
+            # Migrate the old single "users" blob to per-user keys
             users_data = self.storage.get("users", {})
             if users_data:
                 for user_hash, user_data in users_data.items():
-                    self.distro_list.add(user_hash)
-                    self.user_groups[user_hash] = set(user_data.get("groups", []))
-                    self.muted_users[user_hash] = set(user_data.get("muted_groups", []))
+                    self._load_user(user_hash, user_data)
+                # Keep the old blob until every user has been written
+                try:
+                    for user_hash in users_data:
+                        self._write_user(user_hash)
+                except Exception as e:
+                    self.logger.error("Error migrating users, keeping old data: %s", e)
+                else:
+                    self.storage.delete("users")
+                    self.logger.info(
+                        "Migrated %d users to per-user keys", len(users_data)
+                    )
+
             self.logger.info("Loaded %d users from storage", len(self.distro_list))
         except Exception as e:
             self.logger.error("Error loading state from storage: %s", e)
 
-    def save_state_to_storage(self):
-        """Save current state to storage"""
+    def _load_user(self, user, user_data):
+        """Restore a single user's state from stored data"""
+        user = sys.intern(user)
+        groups = user_data.get("groups", [])
+        muted_groups = user_data.get("muted_groups", [])
+        self.distro_list.add(user)
+        self._user_state[user] = (
+            self._groups_to_mask(groups),
+            self._groups_to_mask(muted_groups),
+        )
+        for group in groups:
+            self.group_subscribers[group].add(user)
+        for group in muted_groups:
+            self.group_muted[group].add(user)
+
+    def _group_bit(self, group):
+        """Return the bitmask for a group, assigning it a bit if it is new"""
+        idx = self._group_idx.get(group)
+        if idx is None:
+            idx = self._group_idx[group] = len(self._groups_by_idx)
+            self._groups_by_idx.append(sys.intern(group))
+        return 1 << idx
+
+    def _groups_to_mask(self, groups):
+        """Return the bitmask with the bits of all given groups set"""
+        mask = 0
+        for group in groups:
+            mask |= self._group_bit(group)
+        return mask
+
+    def _mask_to_groups(self, mask):
+        """Return the groups whose bits are set in a bitmask"""
+        return [
+            group for idx, group in enumerate(self._groups_by_idx) if (mask >> idx) & 1
+        ]
+
+    def _mask_has_group(self, mask, group):
+        """Check whether a group's bit is set in a bitmask"""
+        idx = self._group_idx.get(group)
+        return idx is not None and (mask >> idx) & 1 == 1
+
+    def _write_user(self, user):
+        """Write a single user's state to storage, raising on failure"""
+        groups_mask, muted_mask = self._user_state[user]
+        self.storage.set(
+            f"{USER_KEY_PREFIX}{user}",
+            {
+                "groups": self._mask_to_groups(groups_mask),
+                "muted_groups": self._mask_to_groups(muted_mask),
+            },
+        )
+
+    def save_user_to_storage(self, user):
+        """Save a single user's state to storage"""
+        try:
+            self._write_user(user)
+            self.logger.debug("Saved %s to storage", user)
+        except Exception as e:
+            self.logger.error(f"Error saving {user} to storage: {e}")
+
+    def delete_user_from_storage(self, user):
+        """Remove a single user's state from storage"""
         try:
-            users_data = {}
-            for user in self.distro_list:
-                users_data[user] = {
-                    "groups": list(self.user_groups[user]),
-                    "muted_groups": list(self.muted_users[user]),
-                }
-            self.storage.set("users", users_data)
-            self.logger.debug("Saved state to storage")
+            self.storage.delete(f"{USER_KEY_PREFIX}{user}")
+            self.logger.debug("Deleted %s from storage", user)
         except Exception as e:
-            self.logger.error(f"Error saving state to storage: {e}")
+            self.logger.error(f"Error deleting {user} from storage: {e}")
+
+    def _mark_dirty(self, user):
+        """Schedule a user's state to be written on the next flush"""
+        with self._dirty_lock:
+            self._dirty_users.add(user)
+
+    def flush_user_state(self):
+        """Write the state of every user changed since the last flush"""
+        with self._dirty_lock:
+            dirty, self._dirty_users = self._dirty_users, set()
+        for user in dirty:
+            if user in self.distro_list:
+                self.save_user_to_storage(user)
+            else:
+                self.delete_user_from_storage(user)
 
     def add_to_distro_list(self, user):
         """Add a user to the distribution list"""
         if user not in self.distro_list:
+            user = sys.intern(user)
             self.distro_list.add(user)
             # Add default groups if configured
-            default_groups = self.config.get(
-                "bot", "default_groups", fallback=""
-            ).split(",")
-            default_groups = [g.strip() for g in default_groups if g.strip()]
-            for group in default_groups:
-                self.user_groups[user].add(group)
+            self._user_state[user] = (self._groups_to_mask(self.default_groups), 0)
+            for group in self.default_groups:
+                self.group_subscribers[group].add(user)
 
-            # Save updated state
-            self.save_state_to_storage()
+            # Persist updated state on the next flush
+            self._mark_dirty(user)
 
             # Send welcome message
             welcome_msg = f"You have been added to the JS8Call message group"
-            if default_groups:
+            if self.default_groups:
                 welcome_msg += (
-                    f" and the following default groups: {', '.join(default_groups)}"
+                    " and the following default groups: "
+                    f"{', '.join(self.default_groups)}"
                 )
             welcome_msg += ". You will receive messages when they are available."
             self.send(user, welcome_msg)
@@ -165,11 +380,14 @@ class JS8CallBot(LXMFBot):
         """Remove a user from the distribution list"""
         if user in self.distro_list:
             self.distro_list.remove(user)
-            self.user_groups.pop(user, None)
-            self.muted_users.pop(user, None)
+            groups_mask, muted_mask = self._user_state.pop(user, (0, 0))
+            for group in self._mask_to_groups(groups_mask):
+                self.group_subscribers[group].discard(user)
+            for group in self._mask_to_groups(muted_mask):
+                self.group_muted[group].discard(user)
 
-            # Save updated state
-            self.save_state_to_storage()
+            # Persist updated state on the next flush
+            self._mark_dirty(user)
 
             self.send(
                 user,
@@ -182,12 +400,15 @@ class JS8CallBot(LXMFBot):
     def add_user_to_groups(self, user, groups):
         """Add a user to specified groups"""
         if user in self.distro_list:
+            groups_mask, muted_mask = self._user_state[user]
             for group in groups:
-                if group in self.js8groups or group in self.js8urgent:
-                    self.user_groups[user].add(group)
+                if group in self.js8groups_set or group in self.js8urgent_set:
+                    groups_mask |= self._group_bit(group)
+                    self.group_subscribers[group].add(user)
+            self._user_state[user] = (groups_mask, muted_mask)
 
-            # Save updated state
-            self.save_state_to_storage()
+            # Persist updated state on the next flush
+            self._mark_dirty(user)
 
             self.send(
                 user,
@@ -202,11 +423,14 @@ class JS8CallBot(LXMFBot):
 
     def remove_user_from_group(self, user, group):
         """Remove a user from a specific group"""
-        if user in self.distro_list and group in self.user_groups[user]:
-            self.user_groups[user].remove(group)
+        groups_mask, muted_mask = self._user_state.get(user, (0, 0))
+        if self._mask_has_group(groups_mask, group):
+            groups_mask &= ~self._group_bit(group)
+            self._user_state[user] = (groups_mask, muted_mask)
+            self.group_subscribers[group].discard(user)
 
-            # Save updated state
-            self.save_state_to_storage()
+            # Persist updated state on the next flush
+            self._mark_dirty(user)
 
             self.send(user, f"You have been removed from the group: {group}")
             self.logger.info(f"Removed {user} from group: {group}")
@@ -279,38 +503,92 @@ class JS8CallBot(LXMFBot):
         js8call_thread.daemon = True
         js8call_thread.start()
 
+        # Persist user changes on a timer, independent of the JS8Call link
+        state_thread = threading.Thread(target=self.user_state_loop, daemon=True)
+        state_thread.start()
+
         # Run the main LXMFBot loop
         try:
             super().run()
         except KeyboardInterrupt:
             self.logger.info("Shutting down JS8Call LXMF bot...")
         finally:
-            if self.js8call_socket:
-                self.js8call_socket.close()
-            self.storage.cleanup()
+            try:
+                # Stop the JS8Call loop before the final flush so no rows are
+                # queued after it
+                self._shutdown.set()
+                js8call_thread.join()
+                if self.js8call_socket:
+                    self.js8call_socket.close()
+                self.flush_pending_inserts()
+                state_thread.join()
+                self.flush_user_state()
+                self.storage.cleanup()
+            finally:
+                # Always drain queued log records, even if shutdown failed
+                self.log_listener.stop()
 
     def js8call_loop(self):
-        while True:
+        while not self._shutdown.is_set():
             try:
                 if not self.js8call_connected:
                     self.connect_js8call()
                 if self.js8call_connected:
-                    self.process_js8call_messages()
-                time.sleep(1)
+                    # Block until JS8Call sends data, waking up in time to
+                    # flush pending inserts while the link is idle
+                    readable, _, _ = select.select(
+                        [self.js8call_socket], [], [], INSERT_FLUSH_INTERVAL
+                    )
+                    if readable:
+                        self.process_js8call_messages()
+                if not self.js8call_connected:
+                    # Connecting failed or the link dropped: store what was
+                    # received and back off before the next attempt
+                    self.flush_pending_inserts()
+                    self._wait_before_reconnect()
+                elif (
+                    time.monotonic() - self._last_insert_flush >= INSERT_FLUSH_INTERVAL
+                ):
+                    self.flush_pending_inserts()
             except Exception as e:
                 self.logger.error(f"JS8Call loop error: {e}")
-                time.sleep(5)
+                self.js8call_connected = False
+                self._wait_before_reconnect()
+
+    def user_state_loop(self):
+        """Periodically write changed user state until shutdown"""
+        while not self._shutdown.wait(USER_STATE_FLUSH_INTERVAL):
+            try:
+                self.flush_user_state()
+            except Exception as e:
+                self.logger.error(f"User state flush error: {e}")
+
+    def _wait_before_reconnect(self):
+        """Sleep before the next connection attempt with exponential backoff"""
+        self._shutdown.wait(self._reconnect_delay)
+        self._reconnect_delay = min(RECONNECT_DELAY_MAX, self._reconnect_delay * 2)
 
     def connect_js8call(self):
         """Connect to JS8Call instance"""
         self.logger.info(f"Connecting to JS8Call on {self.js8call_server}")
+        if self.js8call_socket:
+            self.js8call_socket.close()
         self.js8call_socket = socket(AF_INET, SOCK_STREAM)
         try:
             self.js8call_socket.connect(self.js8call_server)
+            self.js8call_socket.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+            # Detect a dead JS8Call peer instead of waiting on it forever
+            self.js8call_socket.setsockopt(SOL_SOCKET, SO_KEEPALIVE, 1)
+            for option, value in KEEPALIVE_OPTIONS:
+                if option is not None:
+                    self.js8call_socket.setsockopt(IPPROTO_TCP, option, value)
+            self._rxbuf = bytearray()
+            self._rx_discarding = False
             self.js8call_connected = True
             self.logger.info("Connected to JS8Call")
         except Exception as e:
             self.logger.error(f"Failed to connect to JS8Call: {e}")
+            self.js8call_socket.close()
             self.js8call_socket = None
             self.js8call_connected = False
 
@@ -321,21 +599,44 @@ class JS8CallBot(LXMFBot):
 
         try:
             # Read data from socket
-            data = self.js8call_socket.recv(4096).decode("utf-8")
+            data = self.js8call_socket.recv(65536)
             if not data:
                 self.js8call_connected = False
                 self.logger.warning("JS8Call connection lost")
                 return
 
-            # Process JSON messages
-            messages = data.strip().split("\n")
+            # Process complete newline-terminated JSON messages and keep any
+            # trailing partial message until the rest of it arrives. Only the
+            # new data is split; its first line completes the buffered one.
+            *messages, partial = data.split(b"\n")
+            if messages:
+                if self._rx_discarding:
+                    # Tail of an oversized message that was already dropped
+                    messages.pop(0)
+                    self._rx_discarding = False
+                else:
+                    messages[0] = bytes(self._rxbuf) + messages[0]
+                self._rxbuf = bytearray(partial)
+                # Only a link that delivers frames counts as healthy; one
+                # that is accepted and dropped straight away keeps backing off
+                self._reconnect_delay = RECONNECT_DELAY_MIN
+            elif not self._rx_discarding:
+                self._rxbuf += partial
+
+            if len(self._rxbuf) > RX_BUFFER_LIMIT:
+                self.logger.error(
+                    "Discarding JS8Call message longer than %d bytes", RX_BUFFER_LIMIT
+                )
+                self._rxbuf = bytearray()
+                self._rx_discarding = True
+
             for message in messages:
                 try:
-                    if not message:
+                    if not message.strip():
                         continue
-                    msg_data = json.loads(message)
+                    msg_data = _json.loads(message)
                     self.handle_js8call_message(msg_data)
-                except json.JSONDecodeError as e:
+                except (_json.JSONDecodeError, UnicodeDecodeError) as e:
                     self.logger.error(f"Failed to parse JS8Call message: {e}")
                     continue
 
@@ -348,38 +649,32 @@ class JS8CallBot(LXMFBot):
         try:
             if data["type"] == "RX.DIRECTED":
                 # Parse directed message
-                parts = data["value"].split(":")
-                if len(parts) < 2:
+                sender, separator, content = data["value"].partition(":")
+                if not separator:
                     self.logger.warning(
                         "Invalid directed message format: %s", data["value"]
                     )
                     return
 
-                sender = parts[0].strip()
-                content = ":".join(parts[1:]).strip()
+                sender = sender.strip()
+                content = content.strip()
 
                 # Check for blocked words
-                if any(word.lower() in content.lower() for word in self.blocked_words):
+                if self._blocked_re and self._blocked_re.search(content.lower()):
                     self.logger.info(
                         "Message from %s contains blocked words. Skipping.", sender
                     )
                     return
 
                 # Forward to LXMF users based on message type
-                if any(content.startswith(group) for group in self.js8groups):
-                    # Group message
-                    for group in self.js8groups:
-                        if content.startswith(group):
-                            message = content[len(group) :].strip()
+                for group in self._sorted_prefixes:
+                    if content.startswith(group):
+                        message = content[len(group) :].strip()
+                        if self._group_routes[group] == "group":
                             self.forward_group_message(sender, group, message)
-                            break
-                elif any(content.startswith(group) for group in self.js8urgent):
-                    # Urgent message
-                    for group in self.js8urgent:
-                        if content.startswith(group):
-                            message = content[len(group) :].strip()
+                        else:
                             self.forward_urgent_message(sender, group, message)
-                            break
+                        break
                 else:
                     # Direct message
                     self.forward_direct_message(sender, content)
@@ -391,65 +686,84 @@ class JS8CallBot(LXMFBot):
         """Forward a direct message to all LXMF users"""
         formatted_message = f"Direct message from {sender}: {message}"
         self._send_to_users(formatted_message)
-        self.db.insert_message(sender, "DIRECT", message)
+        self._queue_insert("DIRECT", sender, "DIRECT", message)
         self.logger.info("Forwarded direct message from %s", sender)
 
     def forward_group_message(self, sender: str, group: str, message: str):
         """Forward a group message to subscribed LXMF users"""
         formatted_message = f"Group message from {sender} to {group}: {message}"
         self._send_to_users(formatted_message, group)
-        self.db.insert_message(sender, group, message)
+        self._queue_insert("GROUP", sender, group, message)
         self.logger.info("Forwarded group message from %s to %s", sender, group)
 
     def forward_urgent_message(self, sender: str, group: str, message: str):
         """Forward an urgent message to subscribed LXMF users"""
         formatted_message = f"URGENT message from {sender} to {group}: {message}"
         self._send_to_users(formatted_message, group)
-        self.db.insert_message(sender, group, message)
+        self._queue_insert("URGENT", sender, group, message)
         self.logger.info("Forwarded urgent message from %s to %s", sender, group)
 
+    def _queue_insert(self, kind: str, sender: str, receiver: str, message: str):
+        """Queue a message for the next batched database insert"""
+        # Stamp the row now, in the same format as SQLite's CURRENT_TIMESTAMP,
+        # so it records when the frame arrived rather than when it was flushed
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        with self._pending_lock:
+            self._pending_inserts.append((kind, sender, receiver, message, timestamp))
+            pending = len(self._pending_inserts)
+        if pending >= INSERT_BATCH_SIZE:
+            self.flush_pending_inserts()
+
+    def flush_pending_inserts(self):
+        """Write all queued messages to the database in one transaction"""
+        with self._pending_lock:
+            rows = list(self._pending_inserts)
+            self._pending_inserts.clear()
+            self._last_insert_flush = time.monotonic()
+        if not rows:
+            return
+        try:
+            self.db.insert_messages_batch(rows)
+        except Exception as e:
+            self.logger.error("Error storing %d messages: %s", len(rows), e)
+
+    def _send_worker(self):
+        """Deliver queued messages to LXMF users"""
+        while True:
+            user, message = self.send_queue.get()
+            try:
+                self.send(user, message)
+            except Exception as e:
+                self.logger.error("Error sending message to %s: %s", user, e)
+            finally:
+                self.send_queue.task_done()
+
     def _send_to_users(self, message: str, group: str = None):
-        """Send a message to all users or group subscribers"""
-        futures = []
-        for user in self.distro_list:
-            if group is None or (
-                group in self.user_groups[user] and group not in self.muted_users[user]
-            ):
-                futures.append(self.thread_pool.submit(self.send, user, message))
-        concurrent.futures.wait(futures)
+        """Queue a message for all users or group subscribers"""
+        if group is None:
+            recipients = tuple(self.distro_list)
+        else:
+            recipients = self.group_subscribers.get(
+                group, set()
+            ) - self.group_muted.get(group, set())
+        for user in recipients:
+            self.send_queue.put((user, message))
 
     def show_help(self):
         """Return help message with available commands"""
-        return (
-            "Available commands:\n"
-            "/add - Add yourself to the JS8Call message group\n"
-            "/remove - Remove yourself from the JS8Call message group\n"
-            "/groups - Show available groups and your subscriptions\n"
-            "/join <group1> <group2> ... - Join one or more groups\n"
-            "/leave <group> - Leave a specific group\n"
-            "/mute <group1> <group2> ... or ALL - Mute one or more groups or all groups\n"
-            "/unmute <group1> <group2> ... or ALL - Unmute one or more groups or all groups\n"
-            "/help - Show this help message\n"
-            "/showlog <number> - Show the last <number> messages (max 50)\n"
-            "/stats - Show current stats\n"
-            "/stats <day|month> - Show stats for the specified period\n"
-            "/info - Show bot information\n"
-            "/analytics [day|week] - Show usage statistics"
-        )
+        return _HELP_TEXT
 
     def show_groups(self, user):
         """Show available groups and user's subscriptions"""
-        available_groups = set(self.js8groups + self.js8urgent)
-        user_groups = self.user_groups.get(user, set())
-        muted_groups = self.muted_users.get(user, set())
-
-        output = "Available groups:\n"
-        for group in available_groups:
-            status = "[Subscribed]" if group in user_groups else "[Not subscribed]"
-            if group in muted_groups:
-                status += " [Muted]"
-            output += f"{group} {status}\n"
-        return output
+        groups_mask, muted_mask = self._user_state.get(user, (0, 0))
+        has_group = self._mask_has_group
+
+        return "Available groups:\n" + "".join(
+            f"{group} "
+            f"{'[Subscribed]' if has_group(groups_mask, group) else '[Not subscribed]'}"
+            f"{' [Muted]' if has_group(muted_mask, group) else ''}\n"
+            for group in self._available_groups
+        )
 
     def show_info(self):
         """Show bot information"""
@@ -466,21 +780,7 @@ class JS8CallBot(LXMFBot):
     def show_log(self, num_messages):
         """Show recent messages"""
         num_messages = min(int(num_messages), 50)
-        messages = self.execute_db_query(
-            """
-            SELECT sender, receiver, message, timestamp
-            FROM (
-                SELECT sender, receiver, message, timestamp FROM messages
-                UNION ALL
-                SELECT sender, groupname as receiver, message, timestamp FROM groups
-                UNION ALL
-                SELECT sender, groupname as receiver, message, timestamp FROM urgent
-            )
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """,
-            (num_messages,),
-        )
+        messages = self.db.get_recent_messages(num_messages)
 
         log_output = f"Last {len(messages)} messages:\n\n"
         for msg in reversed(messages):
@@ -494,27 +794,34 @@ class JS8CallBot(LXMFBot):
 
         if period == "day":
             date = datetime.now().strftime("%Y-%m-%d")
-            stats = self.execute_db_query(
-                "SELECT user_count FROM stats WHERE date = ?", (date,)
-            )
-            if stats:
-                output += f"Users today: {stats[0][0]}\n"
+            user_count = self._cached_stat(period, date, self.db.get_user_count)
+            if user_count is not None:
+                output += f"Users today: {user_count}\n"
             else:
                 output += "No data for today\n"
         elif period == "month":
             current_month = datetime.now().strftime("%Y-%m")
-            stats = self.execute_db_query(
-                "SELECT AVG(user_count) FROM stats WHERE date LIKE ?",
-                (f"{current_month}%",),
+            avg_users = self._cached_stat(
+                period, current_month, self.db.get_average_user_count
             )
-            if stats and stats[0][0] is not None:
-                avg_users = round(stats[0][0], 2)
+            if avg_users is not None:
+                avg_users = round(avg_users, 2)
                 output += f"Average users this month: {avg_users}\n"
             else:
                 output += "No data for this month\n"
 
         return output
 
+    def _cached_stat(self, period, key, query):
+        """Return query(key), reusing a recent result for the same period"""
+        now = time.monotonic()
+        cached = self._stats_cache.get((period, key))
+        if cached and now - cached[0] < STATS_CACHE_TTL:
+            return cached[1]
+        value = query(key)
+        self._stats_cache[(period, key)] = (now, value)
+        return value
+
 
 if __name__ == "__main__":
     bot = JS8CallBot()
@@ -0,0 +1,101 @@
+"""Logging handlers for the JS8Call LXMF bot."""
+
+import concurrent.futures
+import glob
+import itertools
+import os
+import sys
+from logging.handlers import RotatingFileHandler
+
+
+class AsyncRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that shifts backup files on a background thread.
+
+    On rollover the current log is renamed to a temporary name and a new log
+    file is opened straight away, so the logging thread only pays for a
+    single rename. Shifting the older backups and moving the temporary file
+    into place as the first backup happen on a single worker thread, which
+    keeps consecutive rollovers in order. Rollovers after close() are done
+    synchronously, and temporary files left behind by a crash are moved into
+    the backups when the handler is created.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the handler.
+
+        Args:
+            *args: Positional arguments for RotatingFileHandler
+            **kwargs: Keyword arguments for RotatingFileHandler
+        """
+        super().__init__(*args, **kwargs)
+        self._rotation_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="log-rotation"
+        )
+        self._rollover_count = itertools.count()
+        self._closed = False
+
+        if self.backupCount > 0:
+            self._recover_leftovers()
+
+    def _recover_leftovers(self):
+        """Queue rotated logs that a previous run never moved into place."""
+        pattern = f"{glob.escape(self.baseFilename)}.*.tmp"
+        try:
+            leftovers = sorted(glob.glob(pattern), key=os.path.getmtime)
+        except OSError as e:
+            sys.stderr.write(f"Failed to recover {self.baseFilename} backups: {e}\n")
+            return
+        # Oldest first, so the most recent one ends up as the first backup
+        for temp_name in leftovers:
+            self._rotation_executor.submit(self._shift_backups, temp_name)
+
+    def doRollover(self):
+        """Swap in a new log file and queue the backup renames."""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if self.backupCount > 0 and os.path.exists(self.baseFilename):
+            temp_name = (
+                f"{self.baseFilename}.{os.getpid()}.{next(self._rollover_count)}.tmp"
+            )
+            os.rename(self.baseFilename, temp_name)
+            if self._closed:
+                # The worker is gone once closed; rotate on this thread
+                self._shift_backups(temp_name)
+            else:
+                self._rotation_executor.submit(self._shift_backups, temp_name)
+
+        if not self.delay:
+            self.stream = self._open()
+
+    def _shift_backups(self, temp_name: str):
+        """Rename existing backups and move the rotated log into place.
+
+        Args:
+            temp_name: Temporary name the rotated log file was moved to
+        """
+        try:
+            for i in range(self.backupCount - 1, 0, -1):
+                source = self.rotation_filename(f"{self.baseFilename}.{i}")
+                dest = self.rotation_filename(f"{self.baseFilename}.{i + 1}")
+                if os.path.exists(source):
+                    if os.path.exists(dest):
+                        os.remove(dest)
+                    os.rename(source, dest)
+
+            dest = self.rotation_filename(f"{self.baseFilename}.1")
+            if os.path.exists(dest):
+                os.remove(dest)
+            self.rotate(temp_name, dest)
+        except OSError as e:
+            sys.stderr.write(f"Failed to rotate {self.baseFilename}: {e}\n")
+
+    def close(self):
+        """Wait for queued rotations to finish, then close the log file."""
+        # Rollovers run under the handler lock, so none can be submitted once
+        # the flag is set
+        with self.lock:
+            self._closed = True
+        self._rotation_executor.shutdown(wait=True)
+        super().close()
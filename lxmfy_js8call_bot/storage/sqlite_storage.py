@@ -12,6 +12,51 @@ from lxmfy.storage import StorageBackend
 class SQLiteStorage(StorageBackend):
     """SQLite implementation of the StorageBackend interface."""
 
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-20000",
+        "PRAGMA mmap_size=268435456",
+    )
+
+    GET_SQL = "SELECT value FROM storage WHERE key = ?"
+    SET_SQL = "INSERT OR REPLACE INTO storage (key, value) VALUES (?, ?)"
+    DELETE_SQL = "DELETE FROM storage WHERE key = ?"
+    EXISTS_SQL = "SELECT 1 FROM storage WHERE key = ?"
+    SCAN_SQL = "SELECT key FROM storage WHERE key LIKE ?"
+    # Explicit columns: migrated databases append "kind" after "processed"
+    UNPROCESSED_SQL = """
+        SELECT id, sender, receiver, message, timestamp, processed, kind
+        FROM messages
+        WHERE processed = 0
+    """
+    MARK_PROCESSED_SQL = "UPDATE messages SET processed = 1 WHERE id = ?"
+    INSERT_MESSAGE_SQL = """
+        INSERT INTO messages (sender, receiver, kind, message, timestamp)
+        VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    """
+    RECENT_MESSAGES_SQL = """
+        SELECT sender, receiver, message, timestamp
+        FROM messages
+        ORDER BY timestamp DESC, id DESC
+        LIMIT ?
+    """
+    USER_COUNT_SQL = "SELECT user_count FROM stats WHERE date = ?"
+    AVG_USER_COUNT_SQL = "SELECT AVG(user_count) FROM stats WHERE date LIKE ?"
+    GET_USERS_SQL = "SELECT * FROM users"
+    SAVE_USER_SQL = """
+        INSERT OR REPLACE INTO users (user_hash, groups, muted_groups)
+        VALUES (?, ?, ?)
+    """
+    REMOVE_USER_SQL = "DELETE FROM users WHERE user_hash = ?"
+
+    MESSAGE_KINDS = ("DIRECT", "GROUP", "URGENT")
+
+    # Tables used for group and urgent messages before they were merged into
+    # the messages table, mapped to the kind their rows are migrated as
+    LEGACY_MESSAGE_TABLES = {"groups": "GROUP", "urgent": "URGENT"}
+
     def __init__(self, db_file: str):
         """Initialize SQLite storage.
 
@@ -27,7 +72,11 @@ class SQLiteStorage(StorageBackend):
         """Initialize database connection and create tables."""
         with self.db_lock:
             self.db_conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            for pragma in self.PRAGMAS:
+                self.db_conn.execute(pragma)
             self.create_tables()
+            # All access is serialized by db_lock, so one cursor is reused
+            self.cursor = self.db_conn.cursor()
 
     def create_tables(self):
         """Create necessary database tables if they don't exist."""
@@ -43,24 +92,7 @@ class SQLiteStorage(StorageBackend):
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     sender TEXT,
                     receiver TEXT,
-                    message TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    processed INTEGER DEFAULT 0
-                );
-                
-                CREATE TABLE IF NOT EXISTS groups (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sender TEXT,
-                    groupname TEXT,
-                    message TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    processed INTEGER DEFAULT 0
-                );
-                
-                CREATE TABLE IF NOT EXISTS urgent (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sender TEXT,
-                    groupname TEXT,
+                    kind TEXT DEFAULT 'DIRECT',
                     message TEXT,
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                     processed INTEGER DEFAULT 0
@@ -80,6 +112,49 @@ class SQLiteStorage(StorageBackend):
                 );
             """
             )
+        self.migrate_message_tables()
+
+    def migrate_message_tables(self):
+        """Merge legacy group/urgent tables into the messages table."""
+        with self.db_conn:
+            columns = [
+                row[1] for row in self.db_conn.execute("PRAGMA table_info(messages)")
+            ]
+            if "kind" not in columns:
+                self.db_conn.execute(
+                    "ALTER TABLE messages ADD COLUMN kind TEXT DEFAULT 'DIRECT'"
+                )
+                # Group and urgent messages were both stored with the group
+                # name as receiver, so their kind cannot be recovered
+                self.db_conn.execute(
+                    "UPDATE messages SET kind = NULL WHERE receiver != 'DIRECT'"
+                )
+
+            for table, kind in self.LEGACY_MESSAGE_TABLES.items():
+                exists = self.db_conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    (table,),
+                ).fetchone()
+                if not exists:
+                    continue
+                self.db_conn.execute(
+                    f"""
+                    INSERT INTO messages
+                        (sender, receiver, kind, message, timestamp, processed)
+                    SELECT sender, groupname, ?, message, timestamp, processed
+                    FROM {table}
+                    """,
+                    (kind,),
+                )
+                self.db_conn.execute(f"DROP TABLE {table}")
+                self.logger.info("Migrated %s messages into the messages table", table)
+
+            # Rows sharing a timestamp are ordered newest id first
+            self.db_conn.execute("DROP INDEX IF EXISTS idx_messages_ts")
+            self.db_conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_messages_ts_id "
+                "ON messages(timestamp DESC, id DESC)"
+            )
 
     def get(self, key: str, default: Any = None) -> Any:
         """Retrieve a value from storage.
@@ -92,16 +167,13 @@ class SQLiteStorage(StorageBackend):
             The stored value or default if not found
         """
         with self.db_lock:
-            cursor = self.db_conn.cursor()
             try:
-                cursor.execute("SELECT value FROM storage WHERE key = ?", (key,))
-                result = cursor.fetchone()
+                self.cursor.execute(self.GET_SQL, (key,))
+                result = self.cursor.fetchone()
                 return result[0] if result else default
             except Exception as e:
                 self.logger.error("Error getting key %s: %s", key, e)
                 return default
-            finally:
-                cursor.close()
 
     def set(self, key: str, value: Any) -> None:
         """Store a value in storage.
@@ -111,18 +183,12 @@ class SQLiteStorage(StorageBackend):
             value: The value to store
         """
         with self.db_lock:
-            cursor = self.db_conn.cursor()
             try:
-                cursor.execute(
-                    "INSERT OR REPLACE INTO storage (key, value) VALUES (?, ?)",
-                    (key, str(value)),
-                )
+                self.cursor.execute(self.SET_SQL, (key, str(value)))
                 self.db_conn.commit()
             except Exception as e:
                 self.logger.error("Error setting key %s: %s", key, e)
                 raise
-            finally:
-                cursor.close()
 
     def delete(self, key: str) -> None:
         """Delete a value from storage.
@@ -131,15 +197,12 @@ class SQLiteStorage(StorageBackend):
             key: The key to delete
         """
         with self.db_lock:
-            cursor = self.db_conn.cursor()
             try:
-                cursor.execute("DELETE FROM storage WHERE key = ?", (key,))
+                self.cursor.execute(self.DELETE_SQL, (key,))
                 self.db_conn.commit()
             except Exception as e:
                 self.logger.error("Error deleting key %s: %s", key, e)
                 raise
-            finally:
-                cursor.close()
 
     def exists(self, key: str) -> bool:
         """Check if a key exists in storage.
@@ -151,12 +214,8 @@ class SQLiteStorage(StorageBackend):
             True if key exists, False otherwise
         """
         with self.db_lock:
-            cursor = self.db_conn.cursor()
-            try:
-                cursor.execute("SELECT 1 FROM storage WHERE key = ?", (key,))
-                return cursor.fetchone() is not None
-            finally:
-                cursor.close()
+            self.cursor.execute(self.EXISTS_SQL, (key,))
+            return self.cursor.fetchone() is not None
 
     def scan(self, prefix: str) -> list:
         """Scan for keys with a given prefix.
@@ -168,33 +227,84 @@ class SQLiteStorage(StorageBackend):
             List of matching keys
         """
         with self.db_lock:
-            cursor = self.db_conn.cursor()
-            try:
-                cursor.execute(
-                    "SELECT key FROM storage WHERE key LIKE ?", (f"{prefix}%",)
-                )
-                return [row[0] for row in cursor.fetchall()]
-            finally:
-                cursor.close()
+            self.cursor.execute(self.SCAN_SQL, (f"{prefix}%",))
+            return [row[0] for row in self.cursor.fetchall()]
 
-    def insert_message(self, sender: str, receiver: str, message: str) -> None:
+    def insert_message(
+        self, sender: str, receiver: str, message: str, kind: str = "DIRECT"
+    ) -> None:
         """Insert a new message into the database.
 
         Args:
             sender: Message sender
             receiver: Message receiver
             message: Message content
+            kind: One of "DIRECT", "GROUP" or "URGENT". Defaults to "DIRECT"
+        """
+        self.insert_messages_batch([(kind, sender, receiver, message, None)])
+
+    def insert_messages_batch(self, rows) -> None:
+        """Insert several messages in a single transaction.
+
+        Args:
+            rows: Iterable of (kind, sender, receiver, message, timestamp)
+                tuples, where kind is one of "DIRECT", "GROUP" or "URGENT" and
+                timestamp is a UTC "YYYY-MM-DD HH:MM:SS" string, or None for
+                the current time
         """
+        params = []
+        for kind, sender, receiver, message, timestamp in rows:
+            if kind not in self.MESSAGE_KINDS:
+                raise ValueError(f"Unknown message kind: {kind}")
+            params.append((sender, receiver, kind, message, timestamp))
+
+        if not params:
+            return
+
         with self.db_lock:
-            cursor = self.db_conn.cursor()
-            try:
-                cursor.execute(
-                    "INSERT INTO messages (sender, receiver, message) VALUES (?, ?, ?)",
-                    (sender, receiver, message),
-                )
-                self.db_conn.commit()
-            finally:
-                cursor.close()
+            with self.db_conn:
+                self.cursor.executemany(self.INSERT_MESSAGE_SQL, params)
+
+    def get_recent_messages(self, limit: int) -> list:
+        """Retrieve the most recent messages.
+
+        Args:
+            limit: Maximum number of messages to return
+
+        Returns:
+            List of (sender, receiver, message, timestamp) rows, newest first
+        """
+        with self.db_lock:
+            self.cursor.execute(self.RECENT_MESSAGES_SQL, (limit,))
+            return self.cursor.fetchall()
+
+    def get_user_count(self, date: str):
+        """Get the recorded user count for a day.
+
+        Args:
+            date: Day in YYYY-MM-DD format
+
+        Returns:
+            The user count, or None if nothing was recorded
+        """
+        with self.db_lock:
+            self.cursor.execute(self.USER_COUNT_SQL, (date,))
+            result = self.cursor.fetchone()
+            return result[0] if result else None
+
+    def get_average_user_count(self, month: str):
+        """Get the average recorded user count for a month.
+
+        Args:
+            month: Month in YYYY-MM format
+
+        Returns:
+            The average user count, or None if nothing was recorded
+        """
+        with self.db_lock:
+            self.cursor.execute(self.AVG_USER_COUNT_SQL, (f"{month}%",))
+            result = self.cursor.fetchone()
+            return result[0] if result else None
 
     def get_unprocessed_messages(self) -> list:
         """Retrieve all unprocessed messages.
@@ -203,12 +313,8 @@ class SQLiteStorage(StorageBackend):
             List of unprocessed messages
         """
         with self.db_lock:
-            cursor = self.db_conn.cursor()
-            try:
-                cursor.execute("SELECT * FROM messages WHERE processed = 0")
-                return cursor.fetchall()
-            finally:
-                cursor.close()
+            self.cursor.execute(self.UNPROCESSED_SQL)
+            return self.cursor.fetchall()
 
     def mark_message_processed(self, message_id: int) -> None:
         """Mark a message as processed.
@@ -217,19 +323,15 @@ class SQLiteStorage(StorageBackend):
             message_id: ID of the message to mark
         """
         with self.db_lock:
-            cursor = self.db_conn.cursor()
-            try:
-                cursor.execute(
-                    "UPDATE messages SET processed = 1 WHERE id = ?", (message_id,)
-                )
-                self.db_conn.commit()
-            finally:
-                cursor.close()
+            self.cursor.execute(self.MARK_PROCESSED_SQL, (message_id,))
+            self.db_conn.commit()
 
     def cleanup(self):
         """Close database connection and cleanup resources."""
         if hasattr(self, "db_conn"):
-            self.db_conn.close()
+            with self.db_lock:
+                self.cursor.close()
+                self.db_conn.close()
 
     def get_users(self) -> list:
         """Get all users from the database.
@@ -238,12 +340,8 @@ class SQLiteStorage(StorageBackend):
             List of user records
         """
         with self.db_lock:
-            cursor = self.db_conn.cursor()
-            try:
-                cursor.execute("SELECT * FROM users")
-                return cursor.fetchall()
-            finally:
-                cursor.close()
+            self.cursor.execute(self.GET_USERS_SQL)
+            return self.cursor.fetchall()
 
     def save_user(self, user_hash: str, groups: str, muted_groups: str) -> None:
         """Save or update a user in the database.
@@ -254,18 +352,8 @@ class SQLiteStorage(StorageBackend):
             muted_groups: User's muted groups
         """
         with self.db_lock:
-            cursor = self.db_conn.cursor()
-            try:
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO users (user_hash, groups, muted_groups)
-                    VALUES (?, ?, ?)
-                    """,
-                    (user_hash, groups, muted_groups),
-                )
-                self.db_conn.commit()
-            finally:
-                cursor.close()
+            self.cursor.execute(self.SAVE_USER_SQL, (user_hash, groups, muted_groups))
+            self.db_conn.commit()
 
     def remove_user(self, user_hash: str) -> None:
         """Remove a user from the database.
@@ -274,9 +362,5 @@ class SQLiteStorage(StorageBackend):
             user_hash: Hash of the user to remove
         """
         with self.db_lock:
-            cursor = self.db_conn.cursor()
-            try:
-                cursor.execute("DELETE FROM users WHERE user_hash = ?", (user_hash,))
-                self.db_conn.commit()
-            finally:
-                cursor.close()
+            self.cursor.execute(self.REMOVE_USER_SQL, (user_hash,))
+            self.db_conn.commit()